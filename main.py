@@ -4,6 +4,9 @@ ABOUTME: Main entry point for Apple Mail MCP Server
 Imports all tool modules and runs the unified MCP server.
 """
 
+import argparse
+import os
+
 # Import the central MCP instance
 from mcp_instance import mcp
 
@@ -17,7 +20,33 @@ import tools.draft_tools
 import tools.attachment_tools
 import tools.trash_tools
 import tools.analytics_tools
+import tools.rules_tools
+import tools.snapshot_tools
+import tools.dedup_tools
+
+from utils import outbound_queue, snapshot
 
 if __name__ == "__main__":
-    # Run the MCP server with all registered tools
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Apple Mail MCP Server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default=os.environ.get("APPLE_MAIL_MCP_TRANSPORT", "stdio"),
+        help="stdio (default) for one client, or http/sse to serve many clients from one process"
+    )
+    parser.add_argument("--host", default=os.environ.get("APPLE_MAIL_MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("APPLE_MAIL_MCP_PORT", "8765")))
+    options = parser.parse_args()
+
+    # Resume any queued sends left over from a previous run
+    outbound_queue.start_workers()
+
+    # Map the metadata snapshot up front so the first query is answered immediately
+    snapshot.open_snapshot()
+
+    if options.transport == "stdio":
+        # Run the MCP server with all registered tools
+        mcp.run()
+    else:
+        from utils.http_transport import run_http
+        run_http(options.transport, options.host, options.port)
@@ -3,9 +3,20 @@ ABOUTME: Email composition tools for Apple Mail MCP Server
 Provides tools for composing new emails, replying to emails, and forwarding messages.
 """
 
+from datetime import datetime
 from typing import Optional
 from mcp_instance import mcp
 from utils.applescript import run_applescript_file, inject_preferences
+from utils import outbound_queue
+
+
+def queued_message(job_id: str, description: str) -> str:
+    """Format the confirmation returned when a send is queued"""
+    return (
+        f"✓ Queued: {description}\n"
+        f"Job ID: {job_id}\n"
+        f"Use get_send_status(job_id=\"{job_id}\") to check delivery."
+    )
 
 
 @mcp.tool()
@@ -17,7 +28,8 @@ def compose_email(
     body: str,
     cc: Optional[str] = None,
     bcc: Optional[str] = None,
-    attachment_path: Optional[str] = None
+    attachment_path: Optional[str] = None,
+    queue: bool = False
 ) -> str:
     """
     Compose and send a new email from a specific account.
@@ -30,12 +42,12 @@ def compose_email(
         cc: Optional CC recipients, comma-separated for multiple
         bcc: Optional BCC recipients, comma-separated for multiple
         attachment_path: Optional path to file to attach (e.g., "/tmp/document.pdf")
+        queue: If True, queue the email for background sending and return a job id immediately (default: False)
 
     Returns:
-        Confirmation message with details of the sent email
+        Confirmation message with details of the sent email, or the job id when queued
     """
-    result = run_applescript_file(
-        "composition/compose_email.applescript",
+    args = (
         account,
         to,
         subject,
@@ -44,6 +56,12 @@ def compose_email(
         bcc or "",
         attachment_path or ""
     )
+    if queue:
+        description = f"Email to {to}: {subject}"
+        job_id = outbound_queue.enqueue(description, "composition/compose_email.applescript", *args)
+        return queued_message(job_id, description)
+
+    result = run_applescript_file("composition/compose_email.applescript", *args)
     return result
 
 
@@ -53,7 +71,8 @@ def reply_to_email(
     account: str,
     subject_keyword: str,
     reply_body: str,
-    reply_to_all: bool = False
+    reply_to_all: bool = False,
+    queue: bool = False
 ) -> str:
     """
     Reply to an email matching a subject keyword.
@@ -63,17 +82,23 @@ def reply_to_email(
         subject_keyword: Keyword to search for in email subjects
         reply_body: The body text of the reply
         reply_to_all: If True, reply to all recipients; if False, reply only to sender (default: False)
+        queue: If True, queue the reply for background sending and return a job id immediately (default: False)
 
     Returns:
-        Confirmation message with details of the reply sent
+        Confirmation message with details of the reply sent, or the job id when queued
     """
-    result = run_applescript_file(
-        "composition/reply_to_email.applescript",
+    args = (
         account,
         subject_keyword,
         reply_body,
         "true" if reply_to_all else "false"
     )
+    if queue:
+        description = f"Reply to \"{subject_keyword}\""
+        job_id = outbound_queue.enqueue(description, "composition/reply_to_email.applescript", *args)
+        return queued_message(job_id, description)
+
+    result = run_applescript_file("composition/reply_to_email.applescript", *args)
     return result
 
 
@@ -84,7 +109,8 @@ def forward_email(
     subject_keyword: str,
     to: str,
     message: Optional[str] = None,
-    mailbox: str = "INBOX"
+    mailbox: str = "INBOX",
+    queue: bool = False
 ) -> str:
     """
     Forward an email to one or more recipients.
@@ -95,16 +121,65 @@ def forward_email(
         to: Recipient email address(es), comma-separated for multiple
         message: Optional message to add before forwarded content
         mailbox: Mailbox to search in (default: "INBOX")
+        queue: If True, queue the forward for background sending and return a job id immediately (default: False)
 
     Returns:
-        Confirmation message with details of forwarded email
+        Confirmation message with details of forwarded email, or the job id when queued
     """
-    result = run_applescript_file(
-        "composition/forward_email.applescript",
+    args = (
         account,
         subject_keyword,
         to,
         message or "",
         mailbox
     )
+    if queue:
+        description = f"Forward \"{subject_keyword}\" to {to}"
+        job_id = outbound_queue.enqueue(description, "composition/forward_email.applescript", *args)
+        return queued_message(job_id, description)
+
+    result = run_applescript_file("composition/forward_email.applescript", *args)
     return result
+
+
+@mcp.tool()
+@inject_preferences
+def get_send_status(
+    job_id: Optional[str] = None,
+    limit: int = 20
+) -> str:
+    """
+    Get the status of queued outbound emails (sent with queue=True).
+
+    Args:
+        job_id: Optional job id to look up. If None, lists the most recent jobs.
+        limit: Maximum number of jobs to list when no job_id is given (default: 20)
+
+    Returns:
+        Job state (queued, running, sent, failed, or needs_check when a send timed out or was
+        interrupted and may have gone out) with attempts and last result or error
+    """
+    if job_id:
+        job = outbound_queue.get_job(job_id)
+        if not job:
+            return f"Error: No send job found with id '{job_id}'"
+        jobs = [job]
+    else:
+        jobs = outbound_queue.list_jobs(limit)
+        if not jobs:
+            return "No queued send jobs."
+
+    lines = ["SEND QUEUE STATUS", ""]
+    for job in jobs:
+        created = datetime.fromtimestamp(job["created"]).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(f"[{job['status'].upper()}] {job['id']} - {job['description']}")
+        lines.append(f"   Queued: {created}, attempts: {job['attempts']}")
+        if job["status"] == "queued" and job["attempts"]:
+            retry_at = datetime.fromtimestamp(job["next_attempt"]).strftime("%H:%M:%S")
+            lines.append(f"   Next retry: {retry_at}")
+        if job["error"]:
+            lines.append(f"   Error: {job['error'].strip()}")
+        elif job_id and job["result"]:
+            lines.append(f"   Result: {job['result'].strip()}")
+        lines.append("")
+    return '\n'.join(lines).rstrip()
@@ -0,0 +1,116 @@
+"""
+ABOUTME: Duplicate detection tools for Apple Mail MCP Server
+Provides a tool that finds groups of near-duplicate emails for cleanup with manage_trash.
+"""
+
+from datetime import datetime
+from mcp_instance import mcp
+from utils.applescript import inject_preferences, parse_received, AppleScriptStream
+from utils.dedup import MIN_SHINGLES, MIN_THRESHOLD, normalize, shingles, signature, similarity, find_duplicate_groups
+
+
+@mcp.tool()
+@inject_preferences
+def find_duplicate_emails(
+    account: str,
+    mailbox: str = "INBOX",
+    max_emails: int = 0,
+    similarity_threshold: float = 0.8,
+    keep: str = "newest",
+    max_groups: int = 50
+) -> str:
+    """
+    Find groups of near-duplicate emails (repeated notifications, double imports,
+    newsletter variants) by comparing normalized subjects and bodies.
+
+    Args:
+        account: Account name (e.g., "Gmail", "Work")
+        mailbox: Mailbox to scan (default: "INBOX")
+        max_emails: Maximum number of emails to scan (0 = all)
+        similarity_threshold: Minimum estimated similarity from 0.05 to 1 (default: 0.8);
+            lower values are raised to 0.05
+        keep: Which email of each group to suggest keeping: "newest" or "oldest" (default: "newest")
+        max_groups: Maximum number of groups to show, largest first (default: 50)
+
+    Returns:
+        Duplicate groups with a keep suggestion, plus the message ids of the shown groups
+        to pass to manage_trash(action="move_to_trash", message_ids=...)
+    """
+    valid_keep = ["newest", "oldest"]
+    if keep not in valid_keep:
+        return f"Error: Invalid keep '{keep}'. Use: {', '.join(valid_keep)}"
+    similarity_threshold = min(max(similarity_threshold, MIN_THRESHOLD), 1.0)
+
+    # Only signatures and headers are kept in memory, not message bodies
+    stream = AppleScriptStream(
+        "search/stream_message_content.applescript",
+        account,
+        mailbox,
+        max_emails,
+        2000,
+        max_bytes=0,
+        timeout=3600
+    )
+    messages = []
+    signatures = []
+    skipped = 0
+    for record in stream:
+        if record[0] != "MSG" or len(record) < 6:
+            continue
+        # Messages without a loaded body or with too little text would match on the
+        # subject alone, so they are left out rather than risk false duplicates
+        shingle_set = shingles(normalize(record[4], record[5])) if record[5].strip() else set()
+        if len(shingle_set) < MIN_SHINGLES:
+            skipped += 1
+            continue
+        messages.append({
+            'id': record[1],
+            'sender': record[2],
+            'received': parse_received(record[3]),
+            'subject': record[4],
+        })
+        signatures.append(signature(shingle_set))
+
+    # Each duplicate must itself be similar to the kept message; members that only joined
+    # the group through another member are not suggested
+    groups = []
+    for group in find_duplicate_groups(signatures, similarity_threshold):
+        group.sort(key=lambda index: messages[index]['received'], reverse=(keep == "newest"))
+        keeper = group[0]
+        duplicates = [index for index in group[1:]
+                      if similarity(signatures[keeper], signatures[index]) >= similarity_threshold]
+        if duplicates:
+            groups.append((keeper, duplicates))
+    groups.sort(key=lambda group: len(group[1]), reverse=True)
+
+    lines = ["DUPLICATE EMAILS", "", f"Scanned {len(messages) + skipped} email(s) in {mailbox}"]
+    if skipped:
+        lines.append(f"Skipped {skipped} email(s) with no downloaded content or too little text to compare")
+    lines.append("")
+
+    # Only ids from groups shown here are suggested, so nothing unseen is trashed
+    trash_ids = []
+    for number, (keeper, duplicates) in enumerate(groups[:max_groups], 1):
+        trash_ids.extend(messages[index]['id'] for index in duplicates)
+        lines.append(f"Group {number}: {len(duplicates) + 1} emails - {messages[keeper]['subject']}")
+        for index in [keeper] + duplicates:
+            member = messages[index]
+            marker = "Keep " if index == keeper else "Trash"
+            date = datetime.fromtimestamp(member['received']).strftime('%Y-%m-%d %H:%M') if member['received'] else "?"
+            lines.append(f"   {marker} [{member['id']}] {date} - {member['sender']}")
+        lines.append("")
+
+    if len(groups) > max_groups:
+        lines.append(f"... and {len(groups) - max_groups} more group(s); raise max_groups to review them")
+        lines.append("")
+
+    lines.append("========================================")
+    lines.append(f"DUPLICATE GROUPS: {len(groups)}, shown: {min(len(groups), max_groups)}, "
+                 f"suggested to trash: {len(trash_ids)} email(s)")
+    lines.append("========================================")
+    if trash_ids:
+        lines.append("")
+        lines.append(f"To move the suggested duplicates to trash, call manage_trash(account=\"{account}\", "
+                     f"action=\"move_to_trash\", mailbox=\"{mailbox}\", "
+                     f"message_ids=\"{','.join(trash_ids)}\")")
+    return '\n'.join(lines)
@@ -6,6 +6,8 @@ Provides tools for creating, listing, sending, and deleting draft emails.
 from typing import Optional
 from mcp_instance import mcp
 from utils.applescript import run_applescript_file, inject_preferences
+from utils import outbound_queue
+from tools.composition_tools import queued_message
 
 
 @mcp.tool()
@@ -18,7 +20,8 @@ def manage_drafts(
     body: Optional[str] = None,
     cc: Optional[str] = None,
     bcc: Optional[str] = None,
-    draft_subject: Optional[str] = None
+    draft_subject: Optional[str] = None,
+    queue: bool = False
 ) -> str:
     """
     Manage draft emails - list, create, send, or delete drafts.
@@ -32,6 +35,7 @@ def manage_drafts(
         cc: Optional CC recipients for create
         bcc: Optional BCC recipients for create
         draft_subject: Subject keyword to find draft (required for send/delete)
+        queue: For send, queue the draft for background sending and return a job id immediately (default: False)
 
     Returns:
         Formatted output based on action
@@ -51,8 +55,7 @@ def manage_drafts(
         if not draft_subject:
             return f"Error: 'draft_subject' is required for {action} action"
 
-    result = run_applescript_file(
-        "draft/manage_drafts.applescript",
+    args = (
         account,
         action,
         subject or "",
@@ -62,4 +65,10 @@ def manage_drafts(
         bcc or "",
         draft_subject or ""
     )
+    if queue and action == "send":
+        description = f"Draft \"{draft_subject}\""
+        job_id = outbound_queue.enqueue(description, "draft/manage_drafts.applescript", *args)
+        return queued_message(job_id, description)
+
+    result = run_applescript_file("draft/manage_drafts.applescript", *args)
     return result
@@ -5,7 +5,7 @@ Provides tools for listing, viewing, and getting overview of inbox emails.
 
 from typing import Optional
 from mcp_instance import mcp
-from utils.applescript import run_applescript_file, inject_preferences
+from utils.applescript import run_applescript_file, inject_preferences, AppleScriptStream
 
 
 @mcp.tool()
@@ -26,13 +26,46 @@ def list_inbox_emails(
     Returns:
         Formatted list of emails with subject, sender, date, and read status
     """
-    result = run_applescript_file(
-        "inbox/list_inbox_emails.applescript",
+    # Stream records so large inboxes are never buffered whole; with a single account
+    # max_emails is also the overall limit, so the script can be stopped early
+    stream = AppleScriptStream(
+        "inbox/stream_inbox_emails.applescript",
         account or "",
         max_emails,
-        "true" if include_read else "false"
+        "true" if include_read else "false",
+        max_records=max_emails if account else 0,
+        record_kinds=["MSG"]
     )
-    return result
+
+    lines = ["INBOX EMAILS - ALL ACCOUNTS", ""]
+    total_count = 0
+    for record in stream:
+        kind = record[0]
+        if kind == "ACCOUNT" and len(record) >= 3:
+            lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            lines.append(f"📧 ACCOUNT: {record[1]} ({record[2]} messages)")
+            lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            lines.append("")
+        elif kind == "MSG" and len(record) >= 5:
+            read_indicator = "✓" if record[1] == "true" else "✉"
+            lines.append(f"{read_indicator} {record[2]}")
+            lines.append(f"   From: {record[3]}")
+            lines.append(f"   Date: {record[4]}")
+            lines.append("")
+            total_count += 1
+        elif kind == "ERROR" and len(record) >= 3:
+            lines.append(f"⚠ Error accessing inbox for account {record[1]}")
+            lines.append(f"   {record[2]}")
+            lines.append("")
+
+    if stream.truncated == "byte_cap":
+        lines.append(f"⚠ TRUNCATED: output exceeded {stream.max_bytes} bytes; use max_emails or account to narrow the listing")
+        lines.append("")
+
+    lines.append("========================================")
+    lines.append(f"TOTAL EMAILS: {total_count}")
+    lines.append("========================================")
+    return '\n'.join(lines)
 
 
 @mcp.tool()
@@ -0,0 +1,86 @@
+"""
+ABOUTME: Triage rule tools for Apple Mail MCP Server
+Provides a tool that applies many declarative triage rules to a mailbox in one pass.
+"""
+
+from typing import Any, Dict, List
+from mcp_instance import mcp
+from utils.applescript import run_applescript_file, inject_preferences, parse_message_records
+from utils.message_actions import apply_message_action
+from utils.rules import CompiledRules, validate_rules
+
+@mcp.tool()
+@inject_preferences
+def apply_triage_rules(
+    account: str,
+    rules: List[Dict[str, Any]],
+    mailbox: str = "INBOX",
+    max_emails: int = 0,
+    only_unread: bool = False,
+    dry_run: bool = True
+) -> str:
+    """
+    Apply many triage rules to a mailbox in a single pass.
+
+    All rules are compiled into one matcher and evaluated against each message once;
+    the resulting actions are then applied in grouped batches.
+
+    Args:
+        account: Account name (e.g., "Gmail", "Work")
+        rules: List of rules, evaluated in priority order. Each rule is a dict with:
+            - action: "move", "trash", "mark_read", "mark_unread", "flag", or "unflag"
+            - to_mailbox: Destination for "move" (use "/" for nested mailboxes, e.g., "Projects/Amplify Impact")
+            - subject_keywords: Optional list of keywords matched in the subject (case insensitive)
+            - sender_keywords: Optional list of keywords matched in the sender (case insensitive)
+            - sender_addresses: Optional list of exact sender email addresses
+            - name: Optional rule label
+            A rule matches when any of its criteria matches. Per message, only the first
+            matching move/trash rule applies, and likewise the first matching
+            mark_read/mark_unread and flag/unflag rule.
+        mailbox: Mailbox to triage (default: "INBOX")
+        max_emails: Maximum number of messages to evaluate (0 = all)
+        only_unread: Only evaluate unread messages, i.e. the new-mail feed (default: False)
+        dry_run: If True, only report what would happen (default: True)
+
+    Returns:
+        Summary of matched messages grouped by action
+    """
+    error = validate_rules(rules)
+    if error:
+        return error
+
+    compiled = CompiledRules(rules)
+    output = run_applescript_file(
+        "search/list_message_metadata.applescript",
+        account,
+        mailbox,
+        max_emails,
+        "true" if only_unread else "false"
+    )
+    messages = parse_message_records(output)
+    batches = compiled.plan(messages)
+
+    title = "TRIAGE RULES (DRY RUN)" if dry_run else "TRIAGE RULES"
+    lines = [title, "", f"Evaluated {len(messages)} message(s) in {mailbox} against {len(rules)} rule(s)", ""]
+
+    total = 0
+    # Status changes first so they are applied before messages leave the mailbox
+    for (action, to_mailbox), batch in sorted(batches.items(), key=lambda item: item[0][0] in ("move", "trash")):
+        label = f"{action} → {to_mailbox}" if to_mailbox else action
+        if dry_run:
+            lines.append(f"▸ {label}: {len(batch)} email(s)")
+        else:
+            applied, warnings = apply_message_action(account, mailbox, action, [m['id'] for m in batch], to_mailbox)
+            lines.append(f"✓ {label}: {applied} of {len(batch)} email(s)")
+            lines.extend(f"   {warning}" for warning in warnings)
+        for message in batch[:10]:
+            lines.append(f"   {message.get('subject', '')} — {message.get('sender', '')}")
+        if len(batch) > 10:
+            lines.append(f"   ... and {len(batch) - 10} more")
+        lines.append("")
+        total += len(batch)
+
+    lines.append("========================================")
+    lines.append(f"TOTAL ACTIONS: {total}" + (" (nothing changed)" if dry_run else ""))
+    lines.append("========================================")
+    return '\n'.join(lines)
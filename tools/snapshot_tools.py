@@ -0,0 +1,146 @@
+"""
+ABOUTME: Metadata snapshot tools for Apple Mail MCP Server
+Provides tools for building the on-disk metadata snapshot and answering list/count queries from it.
+"""
+
+import time
+from datetime import datetime
+from typing import List, Optional
+from mcp_instance import mcp
+from utils.applescript import run_applescript_file, inject_preferences, parse_message_records
+from utils import snapshot
+
+
+@mcp.tool()
+@inject_preferences
+def refresh_metadata_snapshot(
+    account: str,
+    mailboxes: Optional[List[str]] = None
+) -> str:
+    """
+    Rebuild the metadata snapshot for mailboxes of an account. The snapshot lets
+    query_metadata_snapshot answer list and count queries instantly, without Mail.
+
+    Args:
+        account: Account name (e.g., "Gmail", "Work")
+        mailboxes: Mailboxes to (re)load (default: ["INBOX"]). Other mailboxes already
+            in the snapshot are kept.
+
+    Returns:
+        Summary of the messages stored per mailbox
+    """
+    mailboxes = mailboxes or ["INBOX"]
+    refreshed = {f"{account}/{mailbox}" for mailbox in mailboxes}
+
+    lines = ["METADATA SNAPSHOT REFRESH", ""]
+    fetched = []
+    for mailbox in mailboxes:
+        output = run_applescript_file(
+            "search/list_message_metadata.applescript",
+            account,
+            mailbox,
+            0,
+            "false"
+        )
+        messages = parse_message_records(output)
+        for message in messages:
+            message["mailbox"] = f"{account}/{mailbox}"
+        fetched.extend(messages)
+        lines.append(f"✓ {account}/{mailbox}: {len(messages)} message(s)")
+
+    # Merge under the lock so a concurrent refresh of other mailboxes is not lost;
+    # rows for mailboxes that are not being refreshed are kept
+    with snapshot.snapshot_write_lock():
+        existing = snapshot.open_snapshot()
+        records = [row for row in existing.rows() if row["mailbox"] not in refreshed] if existing else []
+        total = snapshot.write_snapshot(records + fetched)
+
+    lines.append("")
+    lines.append("========================================")
+    lines.append(f"SNAPSHOT TOTAL: {total} message(s)")
+    lines.append("========================================")
+    return '\n'.join(lines)
+
+
+@mcp.tool()
+@inject_preferences
+def query_metadata_snapshot(
+    action: str = "count",
+    account: Optional[str] = None,
+    mailbox: Optional[str] = None,
+    sender: Optional[str] = None,
+    subject_keyword: Optional[str] = None,
+    unread_only: bool = False,
+    flagged_only: bool = False,
+    days_back: int = 0,
+    max_results: int = 20
+) -> str:
+    """
+    Count or list emails from the metadata snapshot (fast, does not query Mail).
+    Results reflect the last refresh_metadata_snapshot call.
+
+    Args:
+        action: "count" or "list" (default: "count")
+        account: Optional account name; required together with mailbox
+        mailbox: Optional mailbox name within account (e.g., "INBOX")
+        sender: Optional sender keyword to filter by
+        subject_keyword: Optional keyword to filter subjects by
+        unread_only: Only include unread emails (default: False)
+        flagged_only: Only include flagged emails (default: False)
+        days_back: Only include emails received in the last N days (0 = all time)
+        max_results: Maximum number of emails to list (default: 20)
+
+    Returns:
+        Count of matching emails, or a list of them newest first
+    """
+    valid_actions = ["count", "list"]
+    if action not in valid_actions:
+        return f"Error: Invalid action '{action}'. Use: {', '.join(valid_actions)}"
+
+    view = snapshot.open_snapshot()
+    if view is None:
+        return "Error: No metadata snapshot yet. Run refresh_metadata_snapshot first."
+
+    mailbox_path = None
+    if mailbox:
+        if not account:
+            return "Error: 'account' is required when filtering by mailbox"
+        mailbox_path = f"{account}/{mailbox}"
+
+    rows = view.select(
+        mailbox=mailbox_path,
+        sender=sender,
+        subject_keyword=subject_keyword,
+        unread_only=unread_only,
+        flagged_only=flagged_only,
+        since=time.time() - days_back * 86400 if days_back > 0 else 0
+    )
+    # Without a mailbox filter, restrict to the account by prefix
+    if account and not mailbox:
+        rows = (row for row in rows if view.string(view.mailbox_ids[row]).startswith(f"{account}/"))
+
+    snapshot_time = datetime.fromtimestamp(view.stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+
+    if action == "count":
+        count = sum(1 for _ in rows)
+        return f"MATCHING EMAILS: {count} (snapshot from {snapshot_time})"
+
+    lines = [f"SNAPSHOT RESULTS (snapshot from {snapshot_time})", ""]
+    listed = 0
+    for row in rows:
+        if listed >= max_results:
+            break
+        message = view.row(row)
+        read_indicator = "✓" if message["is_read"] else "✉"
+        flag = " ⚑" if message["is_flagged"] else ""
+        lines.append(f"{read_indicator} {message['subject']}{flag}")
+        lines.append(f"   From: {message['sender']}")
+        lines.append(f"   Date: {datetime.fromtimestamp(message['received']).strftime('%Y-%m-%d %H:%M')}")
+        lines.append(f"   Mailbox: {message['mailbox']}")
+        lines.append("")
+        listed += 1
+
+    lines.append("========================================")
+    lines.append(f"LISTED: {listed} email(s)")
+    lines.append("========================================")
+    return '\n'.join(lines)
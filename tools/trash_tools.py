@@ -6,6 +6,7 @@ Provides tools for moving emails to trash, deleting permanently, and emptying tr
 from typing import Optional
 from mcp_instance import mcp
 from utils.applescript import run_applescript_file, inject_preferences
+from utils.message_actions import apply_message_action
 
 
 @mcp.tool()
@@ -16,7 +17,8 @@ def manage_trash(
     subject_keyword: Optional[str] = None,
     sender: Optional[str] = None,
     mailbox: str = "INBOX",
-    max_deletes: int = 5
+    max_deletes: int = 5,
+    message_ids: Optional[str] = None
 ) -> str:
     """
     Manage trash operations - delete emails or empty trash.
@@ -28,6 +30,8 @@ def manage_trash(
         sender: Optional sender to filter emails (not used for empty_trash)
         mailbox: Source mailbox (default: "INBOX", not used for empty_trash or delete_permanent)
         max_deletes: Maximum number of emails to delete (safety limit, default: 5)
+        message_ids: Optional comma-separated message ids (e.g., from find_duplicate_emails) to move
+            to trash from mailbox instead of filtering by subject/sender (move_to_trash only)
 
     Returns:
         Confirmation message with details of deleted emails
@@ -37,6 +41,21 @@ def manage_trash(
     if action not in valid_actions:
         return f"Error: Invalid action '{action}'. Use: {', '.join(valid_actions)}"
 
+    if message_ids:
+        if action != "move_to_trash":
+            return "Error: 'message_ids' can only be used with the move_to_trash action"
+        ids = [message_id.strip() for message_id in message_ids.split(',') if message_id.strip()]
+        if len(ids) > max_deletes:
+            return f"Error: {len(ids)} message ids exceed max_deletes ({max_deletes}). Raise max_deletes to confirm."
+        moved, warnings = apply_message_action(account, mailbox, "trash", ids)
+        lines = ["MOVING EMAILS TO TRASH", ""] + warnings
+        if warnings:
+            lines.append("")
+        lines.append("========================================")
+        lines.append(f"TOTAL MOVED TO TRASH: {moved} of {len(ids)} email(s)")
+        lines.append("========================================")
+        return '\n'.join(lines)
+
     result = run_applescript_file(
         "trash/manage_trash.applescript",
         account,
@@ -4,9 +4,11 @@ Provides helper functions for executing AppleScript commands and parsing email d
 """
 
 import subprocess
+import threading
 import os
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # Load user preferences from environment
 USER_PREFERENCES = os.environ.get("USER_EMAIL_PREFERENCES", "")
@@ -14,6 +16,24 @@ USER_PREFERENCES = os.environ.get("USER_EMAIL_PREFERENCES", "")
 # Base path for AppleScript files
 SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
 
+# Separators used by scripts that emit machine-readable message records
+RECORD_SEPARATOR = '\x1e'
+FIELD_SEPARATOR = '\x1f'
+
+# Byte cap for streamed script output (see AppleScriptStream)
+MAX_OUTPUT_BYTES = int(os.environ.get("APPLE_MAIL_MCP_MAX_OUTPUT_BYTES", str(4 * 1024 * 1024)))
+
+# Concurrent osascript processes allowed per server process, shared by all clients and workers
+MAX_CONCURRENT_SCRIPTS = int(os.environ.get("APPLE_MAIL_MCP_MAX_SCRIPTS", "4"))
+_script_slots = threading.BoundedSemaphore(max(MAX_CONCURRENT_SCRIPTS, 1))
+
+# Directory for persistent server state (outbound queue, etc.)
+STATE_DIR = Path(os.environ.get("APPLE_MAIL_MCP_STATE_DIR", Path.home() / ".apple-mail-mcp"))
+
+
+class AppleScriptTimeout(Exception):
+    """Raised when a script is killed for exceeding its timeout; its effects are unknown"""
+
 
 def inject_preferences(func):
     """Decorator that appends user preferences to tool docstrings"""
@@ -28,15 +48,16 @@ def inject_preferences(func):
 def run_applescript(script: str) -> str:
     """Execute AppleScript string and return output"""
     try:
-        result = subprocess.run(
-            ['osascript', '-e', script],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        with _script_slots:
+            result = subprocess.run(
+                ['osascript', '-e', script],
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
         return result.stdout.strip()
     except subprocess.TimeoutExpired:
-        raise Exception("AppleScript execution timed out")
+        raise AppleScriptTimeout("AppleScript execution timed out")
     except Exception as e:
         raise Exception(f"AppleScript execution failed: {str(e)}")
 
@@ -53,7 +74,7 @@ def run_applescript_file(script_path: str, *args) -> str:
         Script output as string
 
     Example:
-        run_applescript_file("inbox/list_inbox_emails.applescript", "Gmail", 10)
+        run_applescript_file("inbox/get_recent_emails.applescript", "Gmail", 10, "false")
     """
     full_path = SCRIPTS_DIR / script_path
 
@@ -64,12 +85,13 @@ def run_applescript_file(script_path: str, *args) -> str:
         # Build command: osascript <script_path> <arg1> <arg2> ...
         cmd = ['osascript', str(full_path)] + [str(arg) for arg in args]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        with _script_slots:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
 
         if result.returncode != 0:
             raise Exception(f"AppleScript error: {result.stderr}")
@@ -77,11 +99,116 @@ def run_applescript_file(script_path: str, *args) -> str:
         return result.stdout.strip()
 
     except subprocess.TimeoutExpired:
-        raise Exception(f"AppleScript execution timed out: {script_path}")
+        raise AppleScriptTimeout(f"AppleScript execution timed out: {script_path}")
     except Exception as e:
         raise Exception(f"AppleScript execution failed ({script_path}): {str(e)}")
 
 
+class AppleScriptStream:
+    """
+    Run an AppleScript file and read the records it logs as they arrive.
+
+    Scripts emit one record per line via `log` (osascript writes these to stderr
+    immediately), with fields separated by FIELD_SEPARATOR. Iterating yields each
+    record as a list of fields. The child process is killed as soon as
+    max_records is reached, max_bytes of output have been read, or iteration stops.
+
+    After iteration, `truncated` is None, "limit" or "byte_cap".
+
+    Example:
+        stream = AppleScriptStream("inbox/stream_inbox_emails.applescript", "", 0, "true", max_records=100)
+        for record in stream:
+            ...
+    """
+
+    def __init__(self, script_path: str, *args, max_records: int = 0,
+                 max_bytes: int = MAX_OUTPUT_BYTES, record_kinds: Optional[List[str]] = None,
+                 timeout: int = 120):
+        """
+        Args:
+            script_path: Path relative to scripts/ directory
+            *args: Arguments to pass to the AppleScript
+            max_records: Stop after this many records counted towards the limit (0 = unlimited)
+            max_bytes: Stop after this many bytes of output (0 = unlimited)
+            record_kinds: Record kinds (first field) counted towards max_records; None counts all
+            timeout: Seconds before the script is killed
+        """
+        self.script_path = script_path
+        self.full_path = SCRIPTS_DIR / script_path
+        self.args = [str(arg) for arg in args]
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.record_kinds = record_kinds
+        self.timeout = timeout
+        self.truncated: Optional[str] = None
+        self.bytes_read = 0
+
+        if not self.full_path.exists():
+            raise FileNotFoundError(f"AppleScript file not found: {self.full_path}")
+
+    def __iter__(self) -> Iterator[List[str]]:
+        _script_slots.acquire()
+        try:
+            process = subprocess.Popen(
+                ['osascript', str(self.full_path)] + self.args,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1
+            )
+        except Exception as e:
+            _script_slots.release()
+            raise Exception(f"AppleScript execution failed ({self.script_path}): {str(e)}")
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(self.timeout, kill_on_timeout)
+        timer.start()
+        # Non-record lines (e.g. osascript execution errors) are kept for the error message
+        diagnostics = []
+        counted = 0
+
+        try:
+            for line in process.stderr:
+                self.bytes_read += len(line.encode('utf-8'))
+                if self.max_bytes and self.bytes_read > self.max_bytes:
+                    self.truncated = "byte_cap"
+                    return
+
+                line = line.rstrip('\n')
+                if FIELD_SEPARATOR not in line:
+                    if line.strip():
+                        diagnostics.append(line)
+                    continue
+
+                record = line.split(FIELD_SEPARATOR)
+                yield record
+
+                if self.record_kinds is None or record[0] in self.record_kinds:
+                    counted += 1
+                    if self.max_records and counted >= self.max_records:
+                        self.truncated = "limit"
+                        return
+
+            process.wait()
+            if timed_out.is_set():
+                raise Exception(f"AppleScript execution timed out: {self.script_path}")
+            if process.returncode != 0:
+                raise Exception(f"AppleScript execution failed ({self.script_path}): {' '.join(diagnostics)}")
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stderr.close()
+            _script_slots.release()
+
+
 def parse_email_list(output: str) -> List[Dict[str, Any]]:
     """Parse the structured email output from AppleScript"""
     emails = []
@@ -120,3 +247,38 @@ def parse_email_list(output: str) -> List[Dict[str, Any]]:
         emails.append(current_email)
 
     return emails
+
+
+# Field order emitted by search/list_message_metadata.applescript
+MESSAGE_METADATA_FIELDS = ['id', 'subject', 'sender', 'is_read', 'is_flagged', 'received']
+
+
+def parse_received(value: str) -> float:
+    """Convert a "year-month-day seconds" local date from AppleScript to a Unix timestamp"""
+    try:
+        date_part, seconds = value.strip().split(' ')
+        year, month, day = (int(part) for part in date_part.split('-'))
+        return (datetime(year, month, day) + timedelta(seconds=int(seconds))).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def parse_message_records(output: str, fields: List[str] = MESSAGE_METADATA_FIELDS) -> List[Dict[str, Any]]:
+    """Parse record/field separated AppleScript output into a list of dicts"""
+    if output.startswith('Error:'):
+        raise Exception(output)
+
+    records = []
+    for raw_record in output.split(RECORD_SEPARATOR):
+        if not raw_record.strip():
+            continue
+        values = raw_record.split(FIELD_SEPARATOR)
+        record: Dict[str, Any] = dict(zip(fields, values))
+        for key in ('is_read', 'is_flagged'):
+            if key in record:
+                record[key] = record[key].strip() == 'true'
+        if 'received' in record:
+            record['received'] = parse_received(record['received'])
+        records.append(record)
+
+    return records
@@ -0,0 +1,143 @@
+"""
+ABOUTME: Near-duplicate detection for Apple Mail MCP Server
+Computes MinHash signatures over normalized subjects and bodies and groups
+near-duplicates with LSH banding in near-linear time.
+"""
+
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+
+# Signature layout: SIGNATURE_SIZE slots split into bands. Two messages become candidates
+# when any band matches exactly; the band size is chosen per threshold (see banding()).
+SIGNATURE_SIZE = 64
+# Minimum chance that a pair exactly at the threshold shares a band
+MIN_CANDIDATE_PROBABILITY = 0.95
+# Below this a pair at the threshold shares no slot often enough to be found reliably
+MIN_THRESHOLD = 0.05
+SHINGLE_WORDS = 3
+# Messages with fewer distinct shingles are too short to compare reliably
+MIN_SHINGLES = 5
+
+_HASH_MASK = (1 << 64) - 1
+_EMPTY_SLOT = _HASH_MASK
+
+_REPLY_PREFIX_RE = re.compile(r"^\s*((re|fw|fwd|aw|wg)\s*:\s*)+", re.IGNORECASE)
+_QUOTED_LINE_RE = re.compile(r"^\s*>.*$", re.MULTILINE)
+_URL_RE = re.compile(r"https?://\S+")
+_DATE_RE = re.compile(r"\b\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}\b")
+_TIME_RE = re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\b")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(subject: str, body: str) -> List[str]:
+    """
+    Reduce a message to comparable words: reply prefixes, quoted lines and URLs are
+    dropped and dates and times replaced by placeholders, so variants differing only
+    in timestamps or tracking links normalize to the same text. Other numbers are
+    kept, so receipts, alerts and codes with different amounts or ids stay distinct.
+    """
+    subject = _REPLY_PREFIX_RE.sub("", subject or "")
+    body = _URL_RE.sub(" ", _QUOTED_LINE_RE.sub(" ", body or ""))
+    text = f"{subject} {body}".lower()
+    text = _TIME_RE.sub(" timeplaceholder ", _DATE_RE.sub(" dateplaceholder ", text))
+    return _WORD_RE.findall(text)
+
+
+def shingles(words: Sequence[str]) -> Set[str]:
+    """Distinct runs of SHINGLE_WORDS consecutive words"""
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def signature(shingle_set: Set[str]) -> List[int]:
+    """
+    MinHash signature using one-permutation hashing: each shingle is hashed once and
+    assigned to a slot by its hash, keeping the minimum per slot. Empty slots borrow
+    from the next filled slot (densification) so short texts still band consistently.
+    """
+    slots = [_EMPTY_SLOT] * SIGNATURE_SIZE
+    for shingle in shingle_set:
+        # hash() is randomized per process; signatures are only compared within one run
+        value = hash(shingle) & _HASH_MASK
+        slot = value % SIGNATURE_SIZE
+        if value < slots[slot]:
+            slots[slot] = value
+
+    if _EMPTY_SLOT in slots and shingle_set:
+        original = slots[:]
+        for index in range(SIGNATURE_SIZE):
+            if original[index] == _EMPTY_SLOT:
+                distance = 1
+                while original[(index + distance) % SIGNATURE_SIZE] == _EMPTY_SLOT:
+                    distance += 1
+                # Mix in the distance so borrowed values differ from the source slot
+                borrowed = original[(index + distance) % SIGNATURE_SIZE]
+                slots[index] = (borrowed + distance * 0x9E3779B97F4A7C15) & _HASH_MASK
+    return slots
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / SIGNATURE_SIZE
+
+
+def banding(threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows per band) for a threshold: the largest band size that still makes
+    a pair of exactly threshold similarity a candidate with MIN_CANDIDATE_PROBABILITY.
+    Larger bands produce fewer false candidates; smaller bands catch lower similarities.
+    """
+    rows = SIGNATURE_SIZE
+    while rows > 1:
+        bands = SIGNATURE_SIZE // rows
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_CANDIDATE_PROBABILITY:
+            break
+        rows //= 2
+    return SIGNATURE_SIZE // rows, rows
+
+
+def find_duplicate_groups(signatures: Sequence[Sequence[int]], threshold: float = 0.8) -> List[List[int]]:
+    """
+    Group near-duplicate signatures.
+
+    Args:
+        signatures: One signature per message
+        threshold: Minimum estimated similarity for two messages to be linked, clamped to
+            MIN_THRESHOLD..1
+
+    Returns:
+        Groups of signature indices with at least two members, each sorted ascending.
+        Groups are connected components, so members linked only through another
+        member may be less similar to each other than threshold; check them against
+        the message kept before treating them as duplicates.
+    """
+    threshold = min(max(threshold, MIN_THRESHOLD), 1.0)
+    bands, rows = banding(threshold)
+    parent = list(range(len(signatures)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for band in range(bands):
+        start = band * rows
+        buckets: Dict[tuple, List[int]] = {}
+        for index, slots in enumerate(signatures):
+            buckets.setdefault(tuple(slots[start:start + rows]), []).append(index)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Compare against the bucket's first member only, keeping large buckets of
+            # identical notifications linear instead of quadratic
+            representative = members[0]
+            for index in members[1:]:
+                if find(index) != find(representative) and \
+                        similarity(signatures[representative], signatures[index]) >= threshold:
+                    parent[find(index)] = find(representative)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(signatures)):
+        groups.setdefault(find(index), []).append(index)
+    return [sorted(members) for members in groups.values() if len(members) > 1]
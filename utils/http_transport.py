@@ -0,0 +1,136 @@
+"""
+ABOUTME: HTTP transport for Apple Mail MCP Server
+Serves the shared MCP instance over streamable HTTP or SSE so many clients use one
+long-lived process, with bearer-token auth and per-client fairness limits.
+"""
+
+import asyncio
+import functools
+import hmac
+import os
+import secrets
+import sys
+import weakref
+from typing import Optional
+
+import anyio
+import uvicorn
+
+from mcp_instance import mcp
+from utils.applescript import STATE_DIR
+
+TOKEN_FILE = STATE_DIR / "http_token"
+
+# Concurrent tool calls allowed per client session before further calls wait
+MAX_CALLS_PER_CLIENT = int(os.environ.get("APPLE_MAIL_MCP_MAX_CALLS_PER_CLIENT", "2"))
+
+
+def load_token() -> str:
+    """Return the auth token from APPLE_MAIL_MCP_HTTP_TOKEN or the token file, creating one if needed"""
+    token = os.environ.get("APPLE_MAIL_MCP_HTTP_TOKEN")
+    if token:
+        return token
+
+    if TOKEN_FILE.exists():
+        return TOKEN_FILE.read_text().strip()
+
+    STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    try:
+        # Created owner-only from the start so the token is never readable by others
+        fd = os.open(TOKEN_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        # Another server process created it first
+        return TOKEN_FILE.read_text().strip()
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+
+class TokenGate:
+    """ASGI middleware enforcing bearer-token auth on every HTTP request"""
+
+    def __init__(self, app, token: str):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = dict(scope.get("headers") or [])
+            if not hmac.compare_digest(headers.get(b"authorization", b""), self.expected):
+                await self._reject(send, 401, b"Unauthorized")
+                return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(send, status: int, body: bytes) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"www-authenticate", b"Bearer")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def offload_sync_tools(max_calls_per_client: int = MAX_CALLS_PER_CLIENT) -> None:
+    """
+    Run synchronous tools on worker threads so one slow AppleScript call does not
+    block every other client on the event loop, and limit concurrent tool calls per
+    client session. The limit applies to tool execution itself, so it also holds for
+    SSE, where the HTTP request returns before the tool runs. The number of osascript
+    processes is still bounded by the shared limit in utils.applescript.
+    """
+    tool_manager = getattr(mcp, "_tool_manager", None)
+    if tool_manager is None:
+        # Without it every tool would run on the event loop with no per-client limit
+        raise RuntimeError("Cannot offload tools: this FastMCP version has no tool manager")
+
+    # session -> semaphore; entries disappear when a client session is closed
+    client_slots = weakref.WeakKeyDictionary()
+
+    def slots_for_current_client() -> Optional[asyncio.Semaphore]:
+        try:
+            session = mcp.get_context().session
+        except Exception:
+            return None
+        if session not in client_slots:
+            client_slots[session] = asyncio.Semaphore(max(max_calls_per_client, 1))
+        return client_slots[session]
+
+    for tool in tool_manager.list_tools():
+        if tool.is_async:
+            continue
+
+        async def run_in_thread(*args, _fn=tool.fn, **kwargs):
+            call = functools.partial(_fn, *args, **kwargs)
+            slots = slots_for_current_client()
+            if slots is None:
+                return await anyio.to_thread.run_sync(call)
+            async with slots:
+                return await anyio.to_thread.run_sync(call)
+
+        tool.fn = run_in_thread
+        tool.is_async = True
+
+
+def run_http(transport: str = "http", host: str = "127.0.0.1", port: int = 8765,
+             token: Optional[str] = None) -> None:
+    """
+    Serve the MCP instance over HTTP.
+
+    Args:
+        transport: "http" for streamable HTTP (endpoint /mcp) or "sse" (endpoints /sse and /messages/)
+        host: Interface to bind (default: localhost only)
+        port: Port to listen on
+        token: Bearer token clients must send; loaded or generated if None
+    """
+    token = token or load_token()
+    offload_sync_tools()
+
+    app = mcp.streamable_http_app() if transport == "http" else mcp.sse_app()
+
+    print(f"[Apple Mail MCP] Serving {transport} on http://{host}:{port}", file=sys.stderr)
+    if not os.environ.get("APPLE_MAIL_MCP_HTTP_TOKEN"):
+        print(f"[Apple Mail MCP] Bearer token stored in {TOKEN_FILE}", file=sys.stderr)
+
+    uvicorn.run(TokenGate(app, token), host=host, port=port, log_level="warning")
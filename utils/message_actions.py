@@ -0,0 +1,48 @@
+"""
+ABOUTME: Batched message actions for Apple Mail MCP Server
+Applies one action (move, trash, read/flag status) to many messages by id, shared by
+the triage rule and trash tools.
+"""
+
+import re
+from typing import List, Tuple
+
+from utils.applescript import run_applescript_file
+
+# Messages per AppleScript invocation when applying actions
+ACTION_BATCH_SIZE = 200
+
+
+def apply_message_action(account: str, mailbox: str, action: str, message_ids: List[str],
+                         to_mailbox: str = "") -> Tuple[int, List[str]]:
+    """
+    Apply one action to message ids in batches.
+
+    Returns:
+        Number of messages the action was applied to, and warning lines for ids
+        that were not found or could not be updated
+    """
+    applied = 0
+    warnings = []
+    for start in range(0, len(message_ids), ACTION_BATCH_SIZE):
+        batch = message_ids[start:start + ACTION_BATCH_SIZE]
+        result = run_applescript_file(
+            "rules/apply_message_actions.applescript",
+            account,
+            mailbox,
+            action,
+            to_mailbox,
+            ','.join(to_mailbox.split('/')),
+            ','.join(batch)
+        )
+        if result.startswith("Error:"):
+            raise Exception(result)
+        # splitlines() also handles AppleScript's CR line endings
+        for line in result.splitlines():
+            line = line.strip()
+            match = re.match(r"APPLIED:\s*(\d+)", line)
+            if match:
+                applied += int(match.group(1))
+            elif line:
+                warnings.append(line)
+    return applied, warnings
@@ -0,0 +1,209 @@
+"""
+ABOUTME: Persistent outbound mail queue for Apple Mail MCP Server
+Stores send jobs in SQLite and runs them on background worker threads with retry and backoff.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from utils.applescript import STATE_DIR, AppleScriptTimeout, run_applescript_file
+
+QUEUE_DB = STATE_DIR / "outbound_queue.sqlite3"
+
+# Worker and retry settings
+WORKER_COUNT = int(os.environ.get("APPLE_MAIL_MCP_SEND_WORKERS", "1"))
+MAX_ATTEMPTS = int(os.environ.get("APPLE_MAIL_MCP_SEND_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 300.0
+# A running job whose lease expires (e.g. the server died mid-send) may or may not have
+# been sent, so it is marked needs_check instead of being run again
+LEASE_SECONDS = 300.0
+POLL_SECONDS = 5.0
+
+# Output lines the composition and draft scripts print after a successful send
+SUCCESS_MARKERS = ["✓ Email sent successfully!", "✓ Reply sent successfully!",
+                   "✓ Email forwarded successfully!", "✓ Draft sent successfully!"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    script TEXT NOT NULL,
+    args TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    lease_until REAL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    result TEXT,
+    error TEXT
+)
+"""
+
+_wakeup = threading.Event()
+_workers_lock = threading.Lock()
+_workers: List[threading.Thread] = []
+
+
+def _connect() -> sqlite3.Connection:
+    # Queued jobs contain recipients and message bodies, so keep them owner-only;
+    # SQLite gives the -wal and -shm files the same mode as the database file
+    STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(QUEUE_DB, os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        # Also tightens databases created by earlier versions
+        os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+    conn = sqlite3.connect(str(QUEUE_DB), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def enqueue(description: str, script_path: str, *args) -> str:
+    """
+    Queue an AppleScript send job and return its job id.
+
+    Args:
+        description: Short human-readable summary shown in status reports
+        script_path: Path relative to scripts/ directory
+        *args: Arguments passed to the script when the job runs
+    """
+    job_id = uuid.uuid4().hex[:12]
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO jobs (id, description, script, args, status, next_attempt, created, updated) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, description, script_path, json.dumps([str(arg) for arg in args]), now, now, now)
+        )
+    finally:
+        conn.close()
+
+    start_workers()
+    _wakeup.set()
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a job as a dict, or None if it does not exist"""
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return dict(row) if row else None
+
+
+def list_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """Return the most recently created jobs"""
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def _claim_job(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+    """Atomically claim the next due job; safe across threads and processes"""
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'needs_check', lease_until = NULL, updated = ?, "
+            "error = 'Server stopped while sending; check the Sent mailbox before resending' "
+            "WHERE status = 'running' AND lease_until < ?",
+            (now, now)
+        )
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE status = 'queued' AND next_attempt <= ? ORDER BY next_attempt LIMIT 1",
+            (now,)
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated = ? "
+                "WHERE id = ?",
+                (now + LEASE_SECONDS, now, row["id"])
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+
+def _run_job(conn: sqlite3.Connection, job: sqlite3.Row) -> None:
+    attempts = job["attempts"] + 1
+    try:
+        result = run_applescript_file(job["script"], *json.loads(job["args"]))
+    except AppleScriptTimeout as e:
+        # Mail may have sent the message before the script was killed; resending could duplicate it
+        conn.execute(
+            "UPDATE jobs SET status = 'needs_check', error = ?, lease_until = NULL, updated = ? WHERE id = ?",
+            (f"{e}; check the Sent mailbox before resending", time.time(), job["id"])
+        )
+        return
+    except Exception as e:
+        # osascript failures before a result are transient: retry with exponential backoff
+        now = time.time()
+        if attempts >= MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, updated = ? WHERE id = ?",
+                (str(e), now, job["id"])
+            )
+        else:
+            delay = min(BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)), BACKOFF_MAX_SECONDS)
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, next_attempt = ?, lease_until = NULL, updated = ? "
+                "WHERE id = ?",
+                (str(e), now + delay, now, job["id"])
+            )
+        return
+
+    # Bad accounts or recipients ("Error: ...") and missing emails or drafts ("⚠ No ... found")
+    # are reported as output; only a success marker means the email went out, and retrying
+    # the others would not help
+    status = "sent" if any(marker in result for marker in SUCCESS_MARKERS) else "failed"
+    conn.execute(
+        "UPDATE jobs SET status = ?, result = ?, error = ?, lease_until = NULL, updated = ? WHERE id = ?",
+        (status, result, result if status == "failed" else None, time.time(), job["id"])
+    )
+
+
+def _worker_loop() -> None:
+    while True:
+        try:
+            conn = _connect()
+            try:
+                job = _claim_job(conn)
+                if job:
+                    _run_job(conn, job)
+                    continue
+            finally:
+                conn.close()
+        except Exception:
+            # Keep the worker alive if the database is briefly unavailable
+            pass
+        _wakeup.wait(POLL_SECONDS)
+        _wakeup.clear()
+
+
+def start_workers() -> None:
+    """Start the background send workers once per process; picks up jobs left from a previous run"""
+    with _workers_lock:
+        if _workers:
+            return
+        for index in range(max(WORKER_COUNT, 1)):
+            worker = threading.Thread(target=_worker_loop, name=f"outbound-queue-{index}", daemon=True)
+            worker.start()
+            _workers.append(worker)
@@ -0,0 +1,203 @@
+"""
+ABOUTME: Triage rule compiler for Apple Mail MCP Server
+Compiles declarative triage rules into a single matcher (Aho-Corasick automata over
+subject/sender keywords plus exact sender address sets) and plans grouped actions.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Actions a rule can request, split by whether they change the message location
+LOCATION_ACTIONS = ["move", "trash"]
+STATUS_ACTIONS = ["mark_read", "mark_unread", "flag", "unflag"]
+VALID_ACTIONS = LOCATION_ACTIONS + STATUS_ACTIONS
+
+# Actions that contradict each other; per message only the first matching rule in a group applies
+_CONFLICT_GROUPS = {
+    "move": "location",
+    "trash": "location",
+    "mark_read": "read_status",
+    "mark_unread": "read_status",
+    "flag": "flagged_status",
+    "unflag": "flagged_status",
+}
+
+# Keys a rule may contain; the match keys hold lists of strings
+MATCH_KEYS = ["subject_keywords", "sender_keywords", "sender_addresses"]
+RULE_KEYS = ["name", "action", "to_mailbox"] + MATCH_KEYS
+
+# Pulls "user@host" out of "Display Name <user@host>" sender strings
+_ADDRESS_RE = re.compile(r"<([^<>\s]+@[^<>\s]+)>|([^<>\s]+@[^<>\s]+)")
+
+
+class KeywordMatcher:
+    """Case-insensitive Aho-Corasick automaton mapping keywords to payload ids"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, int]]):
+        # Trie stored as parallel lists: goto transitions, failure links, outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for keyword, payload in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._out[state].add(payload)
+
+        # Breadth-first pass to build failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] |= self._out[self._fail[next_state]]
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def find(self, text: str) -> Set[int]:
+        """Return the payload ids of every keyword occurring in text"""
+        found: Set[int] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+def extract_address(sender: str) -> str:
+    """Extract the bare, lower-cased email address from a sender string"""
+    match = _ADDRESS_RE.search(sender or "")
+    if not match:
+        return (sender or "").strip().lower()
+    return (match.group(1) or match.group(2)).lower()
+
+
+class CompiledRules:
+    """
+    A rule set compiled into one matcher.
+
+    Each rule is a dict with:
+        action: "move", "trash", "mark_read", "mark_unread", "flag" or "unflag"
+        to_mailbox: Destination mailbox for "move" (use "/" for nested mailboxes)
+        subject_keywords: Keywords matched anywhere in the subject
+        sender_keywords: Keywords matched anywhere in the sender
+        sender_addresses: Exact sender addresses
+        name: Optional label used in reports
+
+    A rule matches a message when any of its criteria matches. Rules are prioritised
+    in list order: per message, only the first matching move/trash rule applies, and
+    likewise the first matching read-status and flag-status rule.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        error = validate_rules(rules)
+        if error:
+            raise ValueError(error)
+        self.rules = rules
+        subject_terms: List[Tuple[str, int]] = []
+        sender_terms: List[Tuple[str, int]] = []
+        self._addresses: Dict[str, List[int]] = {}
+
+        for index, rule in enumerate(rules):
+            for keyword in rule.get("subject_keywords") or []:
+                subject_terms.append((keyword, index))
+            for keyword in rule.get("sender_keywords") or []:
+                sender_terms.append((keyword, index))
+            for address in rule.get("sender_addresses") or []:
+                self._addresses.setdefault(address.strip().lower(), []).append(index)
+
+        self._subject_matcher = KeywordMatcher(subject_terms)
+        self._sender_matcher = KeywordMatcher(sender_terms)
+
+    def match(self, subject: str, sender: str) -> List[int]:
+        """Return the indices of all rules matching a message, in priority order"""
+        matched: Set[int] = set()
+        if self._subject_matcher:
+            matched |= self._subject_matcher.find(subject or "")
+        if self._sender_matcher:
+            matched |= self._sender_matcher.find(sender or "")
+        if self._addresses:
+            matched.update(self._addresses.get(extract_address(sender), []))
+        return sorted(matched)
+
+    def plan(self, messages: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """
+        Evaluate every rule against each message in a single pass.
+
+        Args:
+            messages: Dicts with 'id', 'subject' and 'sender' keys
+
+        Returns:
+            Mapping of (action, to_mailbox) to the messages that action applies to
+        """
+        batches: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for message in messages:
+            # Also prevents the same message landing in one batch twice
+            groups_taken = set()
+            for index in self.match(message.get("subject", ""), message.get("sender", "")):
+                rule = self.rules[index]
+                action = rule["action"]
+                group = _CONFLICT_GROUPS[action]
+                if group in groups_taken:
+                    continue
+                groups_taken.add(group)
+                key = (action, rule.get("to_mailbox") or "")
+                batches.setdefault(key, []).append(message)
+        return batches
+
+
+def validate_rules(rules: List[Dict[str, Any]]) -> Optional[str]:
+    """Return an error message if the rule list is malformed, otherwise None"""
+    if not rules:
+        return "Error: At least one rule is required"
+
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            return f"Error: Rule #{index + 1} must be an object"
+        label = rule.get("name") or f"#{index + 1}"
+
+        unknown = sorted(set(rule) - set(RULE_KEYS))
+        if unknown:
+            return f"Error: Rule {label} has unknown key(s): {', '.join(unknown)}. Use: {', '.join(RULE_KEYS)}"
+
+        action = rule.get("action")
+        if action not in VALID_ACTIONS:
+            return f"Error: Rule {label} has invalid action '{action}'. Use: {', '.join(VALID_ACTIONS)}"
+        if action == "move":
+            if not isinstance(rule.get("to_mailbox"), str) or not rule["to_mailbox"].strip():
+                return f"Error: Rule {label} needs 'to_mailbox' for the move action"
+        elif "to_mailbox" in rule:
+            return f"Error: Rule {label} has 'to_mailbox', which is only used by the move action"
+
+        # A bare string would otherwise be iterated character by character
+        for key in MATCH_KEYS:
+            value = rule.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+                return f"Error: Rule {label} '{key}' must be a list of non-empty strings"
+
+        if not any(rule.get(key) for key in MATCH_KEYS):
+            return f"Error: Rule {label} needs subject_keywords, sender_keywords or sender_addresses"
+
+    return None
@@ -0,0 +1,271 @@
+"""
+ABOUTME: Memory-mapped message metadata snapshot for Apple Mail MCP Server
+Stores message metadata as fixed-width columns plus a string table, opened with mmap
+so list and count queries need no parsing and pages are shared between processes.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.applescript import STATE_DIR
+
+SNAPSHOT_PATH = STATE_DIR / "metadata.snapshot"
+LOCK_PATH = STATE_DIR / "metadata.snapshot.lock"
+
+MAGIC = b"AMMS"
+VERSION = 1
+
+# Flag bits stored in the flags column
+FLAG_READ = 1
+FLAG_FLAGGED = 2
+
+# magic, version, message count, string count, then byte offsets of:
+# timestamps (int64), message ids (int64), mailbox ids, sender ids, subject ids (uint32),
+# flags (uint8), string offsets (uint64, string count + 1), string data (utf-8)
+_HEADER = struct.Struct("<4sIQQ8Q")
+
+# (name, struct and memoryview type code) of each fixed-width column, in file order
+_COLUMNS = [
+    ("timestamps", "q"),
+    ("message_ids", "q"),
+    ("mailbox_ids", "I"),
+    ("sender_ids", "I"),
+    ("subject_ids", "I"),
+    ("flags", "B"),
+]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+# flock() does not exclude other threads of the same process, hence the thread lock
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def snapshot_write_lock():
+    """
+    Serialize snapshot updates across threads and processes. Hold it around the whole
+    read-merge-write of an update so concurrent refreshes cannot drop each other's rows.
+    """
+    with _write_lock:
+        LOCK_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with open(LOCK_PATH, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def write_snapshot(records: Iterable[Dict[str, Any]], path=SNAPSHOT_PATH) -> int:
+    """
+    Write message metadata to a snapshot file, newest message first.
+
+    Args:
+        records: Dicts with 'id', 'subject', 'sender', 'mailbox', 'received' (Unix time),
+            'is_read' and 'is_flagged' keys
+        path: Destination file; replaced atomically so open readers keep their old view
+
+    Returns:
+        Number of messages written
+    """
+    rows = sorted(records, key=lambda record: record.get("received") or 0, reverse=True)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        value = value or ""
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    columns = {
+        "timestamps": [int(row.get("received") or 0) for row in rows],
+        "message_ids": [int(row.get("id") or 0) for row in rows],
+        "mailbox_ids": [intern(row.get("mailbox", "")) for row in rows],
+        "sender_ids": [intern(row.get("sender", "")) for row in rows],
+        "subject_ids": [intern(row.get("subject", "")) for row in rows],
+        "flags": [(FLAG_READ if row.get("is_read") else 0) | (FLAG_FLAGGED if row.get("is_flagged") else 0)
+                  for row in rows],
+    }
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    # Lay out each section on an 8-byte boundary so memoryview casts are aligned
+    sections = [struct.pack(f"<{len(rows)}{code}", *columns[name]) for name, code in _COLUMNS]
+    sections.append(struct.pack(f"<{len(string_offsets)}Q", *string_offsets))
+    sections.append(b"".join(encoded))
+
+    offsets = []
+    position = _align(_HEADER.size)
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                     dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(rows), len(strings), *offsets))
+            for offset, section in zip(offsets, sections):
+                f.seek(offset)
+                f.write(section)
+            f.truncate(position)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(rows)
+
+
+class MetadataSnapshot:
+    """Read-only, memory-mapped view of a snapshot file; rows are ordered newest first"""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            offsets = self._read_header()
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise
+
+        view = memoryview(self._mmap)
+        for (name, code), offset in zip(_COLUMNS, offsets):
+            size = struct.calcsize(code) * self.count
+            setattr(self, name, view[offset:offset + size].cast(code))
+        self._string_offsets = view[offsets[6]:offsets[6] + 8 * (self.string_count + 1)].cast("Q")
+        self._string_data = offsets[7]
+
+    def _read_header(self) -> List[int]:
+        """Unpack the header and check that every section it points to lies within the file"""
+        size = len(self._mmap)
+        if size < _HEADER.size:
+            raise ValueError(f"Metadata snapshot is truncated: {self.path}")
+
+        magic, version, self.count, self.string_count, *offsets = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a metadata snapshot (or unsupported version): {self.path}")
+
+        section_sizes = [struct.calcsize(code) * self.count for _, code in _COLUMNS]
+        section_sizes.append(8 * (self.string_count + 1))
+        for offset, section_size in zip(offsets, section_sizes):
+            if offset % 8 or offset + section_size > size:
+                raise ValueError(f"Metadata snapshot is truncated or corrupt: {self.path}")
+
+        string_data_size = struct.unpack_from("<Q", self._mmap, offsets[6] + 8 * self.string_count)[0]
+        if offsets[7] + string_data_size > size:
+            raise ValueError(f"Metadata snapshot is truncated or corrupt: {self.path}")
+        return offsets
+
+    def is_current(self) -> bool:
+        """Whether the file on disk is still the one this view maps"""
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (current.st_ino, current.st_mtime_ns) == (self.stat.st_ino, self.stat.st_mtime_ns)
+
+    def string(self, string_id: int) -> str:
+        start = self._string_data + self._string_offsets[string_id]
+        end = self._string_data + self._string_offsets[string_id + 1]
+        return self._mmap[start:end].decode("utf-8")
+
+    def string_ids(self, keyword: str, exact: bool = False) -> set:
+        """Ids of strings equal to (exact) or containing keyword, case insensitive"""
+        keyword = keyword.lower()
+        ids = set()
+        for string_id in range(self.string_count):
+            value = self.string(string_id).lower()
+            if value == keyword if exact else keyword in value:
+                ids.add(string_id)
+        return ids
+
+    def select(self, mailbox: Optional[str] = None, sender: Optional[str] = None,
+               subject_keyword: Optional[str] = None, unread_only: bool = False,
+               flagged_only: bool = False, since: float = 0) -> Iterator[int]:
+        """Yield row indices matching all filters, newest first"""
+        # Resolve text filters to string ids once, then compare integers per row
+        mailbox_ids = self.string_ids(mailbox, exact=True) if mailbox else None
+        sender_ids = self.string_ids(sender) if sender else None
+        subject_ids = self.string_ids(subject_keyword) if subject_keyword else None
+
+        timestamps, flags = self.timestamps, self.flags
+        for row in range(self.count):
+            if since and timestamps[row] < since:
+                # Rows are sorted newest first, so nothing older can match
+                break
+            if unread_only and flags[row] & FLAG_READ:
+                continue
+            if flagged_only and not flags[row] & FLAG_FLAGGED:
+                continue
+            if mailbox_ids is not None and self.mailbox_ids[row] not in mailbox_ids:
+                continue
+            if sender_ids is not None and self.sender_ids[row] not in sender_ids:
+                continue
+            if subject_ids is not None and self.subject_ids[row] not in subject_ids:
+                continue
+            yield row
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return {
+            "id": self.message_ids[row],
+            "received": self.timestamps[row],
+            "mailbox": self.string(self.mailbox_ids[row]),
+            "sender": self.string(self.sender_ids[row]),
+            "subject": self.string(self.subject_ids[row]),
+            "is_read": bool(self.flags[row] & FLAG_READ),
+            "is_flagged": bool(self.flags[row] & FLAG_FLAGGED),
+        }
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.count):
+            yield self.row(row)
+
+    def close(self) -> None:
+        for name, _ in _COLUMNS:
+            getattr(self, name).release()
+        self._string_offsets.release()
+        self._mmap.close()
+
+
+_open_snapshot: Optional[MetadataSnapshot] = None
+
+
+def open_snapshot() -> Optional[MetadataSnapshot]:
+    """
+    Return the shared snapshot view, remapping if another process rebuilt the file.
+    Returns None if there is no snapshot or it is truncated or corrupt.
+    """
+    global _open_snapshot
+    if _open_snapshot is not None and _open_snapshot.is_current():
+        return _open_snapshot
+    if not SNAPSHOT_PATH.exists():
+        return None
+    # The previous view is left for the garbage collector; callers may still be iterating it
+    try:
+        _open_snapshot = MetadataSnapshot(SNAPSHOT_PATH)
+    except (OSError, ValueError, struct.error) as e:
+        # An unreadable snapshot is treated as missing; the next refresh rewrites it
+        print(f"[Apple Mail MCP] Ignoring metadata snapshot: {e}", file=sys.stderr)
+        _open_snapshot = None
+    return _open_snapshot